@@ -29,12 +29,28 @@ import epdconfig
 
 from PIL import Image,  ImageDraw,  ImageFont, ImageOps
 from datetime import datetime
+import os
 import time
-import requests 
+import math
+import numpy as np
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+# orjson is optional, it parses the API responses faster than the standard json module
+try:
+    from orjson import loads as jsonLoads
+except ImportError:
+    from json import loads as jsonLoads
+# Numba is optional, the projection functions fall back to plain Python / numpy without it
+try:
+    import numba
+except ImportError:
+    numba = None
 
 ### Change as desired ###
 ####################################
-# Update interval for fetching positions, should be min. 20 seconds (because a display refresh takes about 15 to 19 seconds)
+# Update interval for fetching positions. Fetching continues while the display refreshes (takes about 15 to 19 seconds),
+# but display updates that come due during a running refresh are skipped
 DATA_INTERVAL = 30 #seconds
 # Time between drawing two big dots on the trace line
 BIG_DOT_INTERVAL = 15 * 60 # seconds
@@ -42,6 +58,13 @@ BIG_DOT_INTERVAL = 15 * 60 # seconds
 DISPLAY_REFRESH_INTERVAL = 3 # Number of DATA_INTERVAL between successive display updates (e.g. 2 => update display every second deta fetch)
 # Maximum past orbits to keep on the display, can be a float
 MAX_ORBIT_TRACES = 1.0
+# Only the changed area of the display is refreshed, but every FULL_REFRESH_INTERVAL seconds the whole display is refreshed to avoid ghosting
+FULL_REFRESH_INTERVAL = 30 * 60 # seconds
+# File the tracked positions are stored in, so the trajectory survives a restart
+POSITIONS_FILE = 'positions.dat'
+# The display is only put to sleep if the next update is more than PANEL_SLEEP_THRESHOLD seconds away,
+# otherwise it stays powered up to save the init sequence on the next update
+PANEL_SLEEP_THRESHOLD = 60 # seconds
 
 ### Map / Geo constants ###
 ###########################
@@ -55,66 +78,295 @@ map_height = 181
 hor_factor = map_width/float(max_lon*2)
 ver_factor = map_height/float(max_lat*2)
 
+### HTTP ###
+############
+# Timeout for a single request to the ISS API
+HTTP_TIMEOUT = 10 # seconds
+
+# Creates a session that keeps the connection to the API alive between fetches,
+# so we don't pay for a new TCP handshake every DATA_INTERVAL seconds
+# (must be called from within the running event loop)
+def createSession():
+    connector = aiohttp.TCPConnector(limit=1)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+
+# Calculates x and y coordinates for the 264x181 world map background picture
+# from longitude and latitude using linear scaing factors hor_factor and hor_factor
+def getXYFromLonLat(lat, lon):
+    x = (int)((lon + max_lon) * hor_factor)
+    # Subtract from map_height because the latitude grows from bottom to the top (-90 to 90), while the y coordinates grow from top to bottom (0 to map_height) 
+    y = (int)(map_height - (lat + max_lat) * ver_factor)
+    return x, y
+
+# Same as getXYFromLonLat(), for whole arrays of latitudes and longitudes at once
+def projectAll(lats, lons):
+    xs = ((lons + max_lon) * hor_factor).astype(np.int32)
+    ys = (map_height - (lats + max_lat) * ver_factor).astype(np.int32)
+    return xs, ys
+
+if numba is not None:
+    # Compile the projection to machine code (cached on disk, so only the very first start pays for compiling)
+    getXYFromLonLat = numba.njit(cache=True)(getXYFromLonLat)
+
+    @numba.njit(cache=True, parallel=True)
+    def projectAll(lats, lons):
+        xs = np.empty(lats.shape[0], dtype=np.int32)
+        ys = np.empty(lats.shape[0], dtype=np.int32)
+        for i in numba.prange(lats.shape[0]):
+            xs[i] = (int)((lons[i] + max_lon) * hor_factor)
+            ys[i] = (int)(map_height - (lats[i] + max_lat) * ver_factor)
+        return xs, ys
+
+# One reading every DATA_INTERVAL seconds, so a big dot every BIG_DOT_INTERVAL/DATA_INTERVAL readings
+POSITION_READINGS_BETWEEN_TWO_BIG_DOTS = max((int)(BIG_DOT_INTERVAL/DATA_INTERVAL),1)
+# Number of positions to keep, only the last MAX_ORBIT_TRACES are shown on the screen (based on one orbit per 90 mins).
+MAX_POSITIONS = max(int(math.ceil(MAX_ORBIT_TRACES * (90 * 60) / DATA_INTERVAL)), 1)
+
+# Whether the i-th reading gets a big dot: one every BIG_DOT_INTERVAL seconds.
+# If the number of readings between two big dots is a power of two, a bitmask replaces the modulo.
+if (POSITION_READINGS_BETWEEN_TWO_BIG_DOTS & (POSITION_READINGS_BETWEEN_TWO_BIG_DOTS - 1) == 0):
+    BIG_DOT_MASK = POSITION_READINGS_BETWEEN_TWO_BIG_DOTS - 1
+    def isBigDot(i):
+        return i & BIG_DOT_MASK == 0
+else:
+    def isBigDot(i):
+        return i % POSITION_READINGS_BETWEEN_TWO_BIG_DOTS == 0
+
+# Fixed size ring buffer of the latest positions, latitudes and longitudes are kept in two separate arrays.
+# It holds MAX_ORBIT_TRACES worth of positions, older ones get overwritten.
+# The buffer is memory mapped to a file, so the positions are restored after a restart.
+class PositionBuffer(object):
+    def __init__(self, capacity, filename):
+        self.capacity = capacity
+        # File layout: header (head, count, total) as int64, followed by all latitudes and then all longitudes as float32
+        headerSize = 3 * np.dtype(np.int64).itemsize
+        fileSize = headerSize + 2 * capacity * np.dtype(np.float32).itemsize
+        if (os.path.exists(filename) and os.path.getsize(filename) == fileSize):
+            mode = 'r+'
+        else:
+            # Missing, or written with a different capacity: start over
+            mode = 'w+'
+        self.header = np.memmap(filename, dtype=np.int64, mode=mode, shape=(3,))
+        self.data = np.memmap(filename, dtype=np.float32, mode='r+', offset=headerSize, shape=(2, capacity))
+        self.lats = self.data[0]
+        self.lons = self.data[1]
+        (head, count, total) = self.header.tolist()
+        if (not (0 <= head < capacity and 0 <= count <= capacity and count <= total)):
+            (head, count, total) = (0, 0, 0)
+        self.head = head # index the next position is written to
+        self.count = count # number of positions in the buffer
+        self.total = total # number of positions appended since the start, used for display refresh and marker logic
+
+    def __len__(self):
+        return self.count
+
+    def append(self, lat, lon):
+        self.lats[self.head] = lat
+        self.lons[self.head] = lon
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+        # Write the position before the header, so a crash in between never points at unwritten data
+        self.data.flush()
+        self.header[:] = (self.head, self.count, self.total)
+        self.header.flush()
+
+    # Returns the latest position as (lat, lon)
+    def last(self):
+        i = (self.head - 1) % self.capacity
+        return float(self.lats[i]), float(self.lons[i])
+
+    # Returns the latitudes and longitudes ordered from oldest to newest
+    def ordered(self):
+        start = (self.head - self.count) % self.capacity
+        indices = (np.arange(self.count) + start) % self.capacity
+        return self.lats[indices], self.lons[indices]
+
 class Display(object):
     def __init__(self, imageWidth, imageHeight):
         self.imageWidth = imageWidth
         self.imageHeight = imageHeight
-        
-    # Draws the ISS current location and trajectory from array of positions
-    def drawISS(self, positions):
-        imageBlack = Image.new('1', (self.imageWidth, self.imageHeight), 255) # 1: clear the frame
-        imageMap = Image.open('world_map_m.bmp').convert('L')
-        if ((int)(time.strftime("%H")) % 2 == 0):
-            imageMap = ImageOps.invert(imageMap)
-        imageBlack.paste(imageMap, (0,0))
+        # The panel is mounted vertically, the (horizontal) image is rotated into the panel buffers, like in EPD.getbuffer()
+        self.panelWidth = imageHeight
+        self.panelHeight = imageWidth
+        # Buffers shown by the last display update, used to find the area that changed since then
+        self.lastBlack = None
+        self.lastRed = None
+        self.lastFullRefresh = None
+        # Whether the display has been initialized and not put to sleep since
+        self.panelAwake = False
+        # Trajectory drawn so far (red layer without the ISS logo) as a packed panel buffer (bit 0: red, bit 1: white),
+        # new positions are added incrementally by clearing the bits of their dot
+        self.trajectory = bytearray(b'\xff' * (self.panelWidth * self.panelHeight // 8))
+        # Latest position (x, y, bigDot), the ISS logo is shown there and its dot is only drawn once the next position arrives
+        self.latest = None
+        # Cursor layer holding only the ISS logo, combined with the trajectory for every frame. Moving the logo
+        # only touches the logo pixels in here, the trajectory never has to be erased.
+        self.cursor = bytearray(b'\xff' * len(self.trajectory))
+        self.cursorXY = None
 
-        imageRed = Image.new('1', (self.imageWidth, self.imageHeight), 255) # 1: clear the frame
+        # Load the background map once and pack it into panel buffers, both for the normal and the inverted map
+        imageMap = Image.open('world_map_m.bmp').convert('L')
+        mapNormal = Image.new('1', (self.imageWidth, self.imageHeight), 255) # 1: clear the frame
+        mapNormal.paste(imageMap, (0,0))
+        mapInverted = Image.new('1', (self.imageWidth, self.imageHeight), 255) # 1: clear the frame
+        mapInverted.paste(ImageOps.invert(imageMap), (0,0))
+        self.mapNormal = self.toPanelBuffer(mapNormal)
+        self.mapInverted = self.toPanelBuffer(mapInverted)
+        # Only the black pixels of the logo get painted, so that the white iss.bmp background does not 'cut' into the trajectory line
         issLogo = Image.open('iss.bmp').convert('L')
-        drawred = ImageDraw.Draw(imageRed)
-  
-        
-        maxPositionsToDraw = len(positions) - (MAX_ORBIT_TRACES * (90 * 60) / DATA_INTERVAL)
-        # Traversing positons in reverse so we can simply break out after MAX_ORBIT_TRACES ('i' starts at len(positions -1))
-        for i,t in reversed(list(enumerate(positions))):
-            # Only draw the last MAX_ORBIT_TRACES on the screen (based on one orbit per 90 mins).
-            if(i < maxPositionsToDraw):
-                # Ignore all older positions but keep them in the list, so that calculations based on len(positions) dont't change
-                break
-            
-            (lat,lon) = t
-            (x,y) = self.getXYFromLonLat(lat, lon)
-
-            # Draw ISS frist (backwards iteration), trajectory line on top, so that the white iss.bmp background does not 'cut' into the trajectory line
-            if (i == len(positions) - 1):
-                # Draw ISS on latest position
-                s = 10 # half the width/height of the issLogo
-                imageRed.paste(issLogo, ((int)(x-s), (int)(y-s)))
-            elif (i % max((int)(BIG_DOT_INTERVAL/DATA_INTERVAL),1) == 0):
-                # Draw big dot every BIG_DOT_INTERVAL seconds (one reading every DATA_INTERVAL seconds, so every BIG_DOT_INTERVAL/DATA_INTERVAL readings)
-                s = 3
-                drawred.ellipse((x-s,y-s,x+s,y+s), fill=0)
+        self.issLogoPixels = self.getPixelOffsets(issLogo.point(lambda p: 255 if p < 128 else 0, '1'), 10) # 10: half the width/height of the issLogo
+        # Dots are drawn from small precomputed pixel lists instead of rasterizing an ellipse for every dot
+        self.bigDotPixels = self.getPixelOffsets(self.createDotMask(3), 3)
+        self.smallDotPixels = self.getPixelOffsets(self.createDotMask(1), 1)
+
+    # Returns a mask with a filled circle of radius s, same shape as ImageDraw.ellipse() draws for a (x-s,y-s,x+s,y+s) box
+    def createDotMask(self, s):
+        mask = Image.new('1', (2*s+1, 2*s+1), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, 2*s, 2*s), fill=255)
+        return mask
+
+    # Returns the (dx, dy) offsets of all set pixels of the mask, relative to its center at (s, s)
+    def getPixelOffsets(self, mask, s):
+        (width, height) = mask.size
+        pixels = mask.load()
+        return [(x-s, y-s) for y in range(height) for x in range(width) if pixels[x, y]]
+
+    # Packs a '1' image into a panel buffer, the same layout EPD.getbuffer() produces for a horizontal image
+    def toPanelBuffer(self, image):
+        white = np.array(image, dtype=bool)
+        # Panel pixel (x, y) is image pixel (y, imageWidth - x - 1)
+        return bytearray(np.packbits(white[:, ::-1].T, axis=1).tobytes())
+
+    # Clears (or with erase=True sets) the bits of the given pixels, centered on image coordinates (x, y),
+    # pixels outside the panel are skipped
+    def drawPixels(self, buf, x, y, pixels, erase = False):
+        for (dx, dy) in pixels:
+            panelX = y + dy
+            panelY = self.panelHeight - 1 - (x + dx)
+            if (0 <= panelX < self.panelWidth and 0 <= panelY < self.panelHeight):
+                if (erase):
+                    buf[(panelX + panelY * self.panelWidth) >> 3] |= 0x80 >> (panelX & 7)
+                else:
+                    buf[(panelX + panelY * self.panelWidth) >> 3] &= ~(0x80 >> (panelX & 7)) & 0xFF
+
+    # Adds a position to the trajectory, only the dot of the previous position is drawn (not the whole trajectory)
+    def addPosition(self, lat, lon, bigDot):
+        (x, y) = getXYFromLonLat(lat, lon)
+        self.addXY(x, y, bigDot)
+
+    # Same as addPosition(), for an already projected position
+    def addXY(self, x, y, bigDot):
+        if (self.latest is not None):
+            (lastX, lastY, big) = self.latest
+            if (big):
+                # Draw big dot every BIG_DOT_INTERVAL seconds
+                pixels = self.bigDotPixels
             else:
                 # Draw small dot
-                s = 1
-                drawred.ellipse((x-s,y-s,x+s,y+s), fill=0)
+                pixels = self.smallDotPixels
+            self.drawPixels(self.trajectory, lastX, lastY, pixels)
+        self.latest = (x, y, bigDot)
+
+    # Redraws the trajectory from scratch from the PositionBuffer, which only holds the last MAX_ORBIT_TRACES
+    def redrawTrajectory(self, positions):
+        self.trajectory[:] = b'\xff' * len(self.trajectory)
+        self.latest = None
+        (lats, lons) = positions.ordered()
+        (xs, ys) = projectAll(lats, lons)
+        # 'i' counts all readings since the start, so big dots stay in place when old positions get dropped
+        first = positions.total - len(positions)
+        addXY = self.addXY
+        for i,(x,y) in enumerate(zip(xs.tolist(), ys.tolist()), first):
+            addXY(x, y, isBigDot(i))
+
+    # Draws the ISS current location on top of the trajectory, returns the Black and Red panel buffers
+    def drawISS(self):
+        # The cached maps are never drawn on, so they can be handed out as they are
+        if ((int)(time.strftime("%H")) % 2 == 0):
+            bufferBlack = self.mapInverted
+        else:
+            bufferBlack = self.mapNormal
+
+        # Move the ISS logo on the cursor layer to the latest position
+        cursorXY = None
+        if (self.latest is not None):
+            (x, y, big) = self.latest
+            cursorXY = (x, y)
+        if (cursorXY != self.cursorXY):
+            if (self.cursorXY is not None):
+                self.drawPixels(self.cursor, self.cursorXY[0], self.cursorXY[1], self.issLogoPixels, erase = True)
+            if (cursorXY is not None):
+                self.drawPixels(self.cursor, cursorXY[0], cursorXY[1], self.issLogoPixels)
+            self.cursorXY = cursorXY
 
-        # return the rendered Red and Black images
-        return imageBlack, imageRed
+        # AND both layers (0 is red) into a new buffer, so the trajectory can keep growing while this frame is sent to the display
+        bufferRed = bytearray(np.bitwise_and(np.frombuffer(self.trajectory, dtype=np.uint8), np.frombuffer(self.cursor, dtype=np.uint8)).tobytes())
 
-    # Calculates x and y coordinates for the 264x181 world map background picture
-    # from longitude and latitude using linear scaing factors hor_factor and hor_factor
-    def getXYFromLonLat(self, lat, lon):
-        x = (int)((lon + max_lon) * hor_factor)
-        # Subtract from map_height because the latitude grows from bottom to the top (-90 to 90), while the y coordinates grow from top to bottom (0 to map_height) 
-        y = (int)(map_height - (lat + max_lat) * ver_factor)
-        return x, y
+        # return the rendered Red and Black buffers
+        return bufferBlack, bufferRed
+
+    # Returns the window (x, y, w, h) of the panel that changed since the last call, None if nothing changed.
+    # x and w are aligned to whole bytes as the panel requires.
+    def getChangedWindow(self, bufferBlack, bufferRed):
+        if (self.lastBlack is None or self.lastRed is None):
+            window = (0, 0, self.panelWidth, self.panelHeight)
+        else:
+            changed = np.frombuffer(bufferBlack, dtype=np.uint8) != np.frombuffer(self.lastBlack, dtype=np.uint8)
+            changed |= np.frombuffer(bufferRed, dtype=np.uint8) != np.frombuffer(self.lastRed, dtype=np.uint8)
+            changed = changed.reshape(self.panelHeight, self.panelWidth // 8)
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            if (len(rows) == 0):
+                window = None
+            else:
+                x = int(cols[0]) * 8
+                y = int(rows[0])
+                window = (x, y, (int(cols[-1]) + 1) * 8 - x, int(rows[-1]) + 1 - y)
+        self.lastBlack = bufferBlack
+        self.lastRed = bufferRed
+        return window
 
 def myPrint(text):
     nowStr = datetime.utcnow().strftime("%H:%M:%S")
     print(nowStr + "> " + text.encode('ascii', 'ignore').decode('ascii'))
 
+# Fetches the current ISS position from the API and returns it as (lat, lon)
+async def fetchPosition(session, url):
+    async with session.get(url) as r:
+        # The API doesn't always send an application/json content type
+        data = await r.json(content_type=None, loads=jsonLoads)
+    lat = float(data['iss_position']['latitude'])
+    lon = float(data['iss_position']['longitude'])
+    return lat, lon
+
+# Pushes the rendered panel buffers to the display, blocks for the whole display refresh
+def updateScreen(epd, display, bufferBlack, bufferRed):
+    myPrint("Updating screen ...")
+    t2 = time.monotonic()
+    if (not display.panelAwake):
+        epd.init()
+        display.panelAwake = True
+    window = display.getChangedWindow(bufferBlack, bufferRed)
+    if (display.lastFullRefresh is None or time.monotonic() - display.lastFullRefresh >= FULL_REFRESH_INTERVAL):
+        epd.display(bufferBlack, bufferRed)
+        display.lastFullRefresh = time.monotonic()
+    elif (window is not None):
+        (x, y, w, h) = window
+        myPrint("Partial refresh of " + str(w) + "x" + str(h) + " at " + str((x, y)))
+        epd.display_partial(bufferBlack, bufferRed, x, y, w, h)
+    else:
+        myPrint("Nothing changed on screen")
+    # Make sure the refresh is done before powering down the panel
+    if (not epd.wait_until_idle()):
+        myPrint("Display still busy")
+    if (DISPLAY_REFRESH_INTERVAL * DATA_INTERVAL > PANEL_SLEEP_THRESHOLD):
+        epd.sleep()
+        display.panelAwake = False
+    myPrint("Updated screen in " + str(round(time.monotonic() - t2)) + "s.")
+
 # The main function    
-def main():
+async def main():
     # API to get ISS Current Location
     URL = 'http://api.open-notify.org/iss-now.json'
 
@@ -122,39 +374,58 @@ def main():
     epd = epd2in7b.EPD()
     display = Display(epd2in7b.EPD_HEIGHT, epd2in7b.EPD_WIDTH)
 
-    positions = []
-    while(True):
-        t0 = time.time()
-        try:
-            r = requests.get(url = URL)
-            data = r.json() 
-        
-            lat = float(data['iss_position']['latitude'])
-            lon = float(data['iss_position']['longitude'])
-        
-            positions.append((lat, lon))
-            myPrint("Fetched new coordinates: " + str(positions[len(positions) -1]))
-        except:
-            myPrint("Problem while fetching new coordinates!")
+    loop = asyncio.get_running_loop()
+    # A single worker thread owns the display (SPI and GPIO are only ever used from that thread),
+    # so fetching continues while the screen refreshes
+    displayExecutor = ThreadPoolExecutor(max_workers=1)
+    # Display update currently running in the worker thread
+    refresh = None
+
+    positions = PositionBuffer(MAX_POSITIONS, POSITIONS_FILE)
+    if (len(positions) > 0):
+        myPrint("Restored " + str(len(positions)) + " positions from " + POSITIONS_FILE)
+        display.redrawTrajectory(positions)
+    # Intervals are measured with the monotonic clock, which doesn't jump when the system time gets set (e.g. by NTP after boot)
+    nextTick = time.monotonic()
+    async with createSession() as session:
+        while(True):
+            try:
+                (lat, lon) = await fetchPosition(session, URL)
+                positions.append(lat, lon)
+                myPrint("Fetched new coordinates: " + str((lat, lon)))
+            except:
+                myPrint("Problem while fetching new coordinates!")
+                if (len(positions) > 0):
+                    myPrint("Appending last position: " + str(positions.last()))
+                    # Appending last positon so logic based on positions.total (display refresh, marker positon) isn't affected by a few fails
+                    (lat, lon) = positions.last()
+                    positions.append(lat, lon)
+
             if (len(positions) > 0):
-                myPrint("Appending last position: " + str(positions[len(positions) - 1]))
-                # Appending last positon so logic based on len(positions) (display refresh, marker positon) isn't affected by a few fails
-                positions.append(positions[len(positions)-1])
-        
-        # Refresh the display on the first fetch and then on every DISPLAY_REFRESH_INTERVAL fetch
-        if (DISPLAY_REFRESH_INTERVAL == 1 or len(positions) % DISPLAY_REFRESH_INTERVAL == 1):
-            myPrint("Updating screen ...")
-            t2 = time.time()
-            epd.init()
-            (imageBlack, imageRed) = display.drawISS(positions)
-            epd.display(epd.getbuffer(imageBlack), epd.getbuffer(imageRed))
-            time.sleep(2)
-            epd.sleep()
-            myPrint("Updated screen in " + str(round(time.time() - t2)) + "s.")
-        
-        t1 = time.time()
-        sleepTime = max(DATA_INTERVAL - (t1 - t0), 0)
-        time.sleep(sleepTime) # Try to keep a data refresh interval of DATA_INTERVAL seconds
+                if (positions.total > positions.capacity and isBigDot(positions.total - 1)):
+                    # Once per big dot interval redraw everything, so positions older than MAX_ORBIT_TRACES disappear
+                    display.redrawTrajectory(positions)
+                else:
+                    (lat, lon) = positions.last()
+                    display.addPosition(lat, lon, isBigDot(positions.total - 1))
+
+            # Refresh the display on the first fetch (also after a restart) and then on every DISPLAY_REFRESH_INTERVAL fetch
+            if (DISPLAY_REFRESH_INTERVAL == 1 or positions.total % DISPLAY_REFRESH_INTERVAL == 1 or refresh is None):
+                if (refresh is None or refresh.done()):
+                    if (refresh is not None):
+                        refresh.result() # re-raise any error from the previous update
+                    (bufferBlack, bufferRed) = display.drawISS()
+                    refresh = loop.run_in_executor(displayExecutor, updateScreen, epd, display, bufferBlack, bufferRed)
+                else:
+                    myPrint("Screen is still updating, skipping this update")
+
+            # Keep a data refresh interval of DATA_INTERVAL seconds by sleeping until the next absolute tick, so delays don't add up
+            nextTick += DATA_INTERVAL
+            now = time.monotonic()
+            if (nextTick < now):
+                # Fell behind by more than a whole interval, skip the missed ticks instead of fetching in a burst
+                nextTick = now
+            await asyncio.sleep(nextTick - now)
 
 
 # gracefully exit without a big exception message if possible
@@ -184,4 +455,10 @@ signal.signal(signal.SIGINT, ctrl_c_handler)
 
 
 if __name__ == '__main__':
-    main()
+    # Use the faster uvloop event loop if it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
@@ -116,12 +116,29 @@ class EPD:
         epdconfig.digital_write(self.cs_pin, 0)
         epdconfig.spi_writebyte([data])
         epdconfig.digital_write(self.cs_pin, 1)
+
+    # Sends a list of data bytes in a single SPI write instead of one write per byte
+    def send_data_bulk(self, data):
+        epdconfig.digital_write(self.dc_pin, 1)
+        epdconfig.digital_write(self.cs_pin, 0)
+        epdconfig.spi_writebyte2(data)
+        epdconfig.digital_write(self.cs_pin, 1)
         
     def ReadBusy(self):
         print("e-Paper busy")
         while(epdconfig.digital_read(self.busy_pin) == 0):      # 0: idle, 1: busy
             epdconfig.delay_ms(100)
         print("e-Paper busy release")
+
+    # Polls the BUSY line until the panel is idle, gives up after timeout_ms. Returns True if the panel is idle
+    def wait_until_idle(self, timeout_ms = 20000):
+        waited = 0
+        while(epdconfig.digital_read(self.busy_pin) == 0):      # 0: busy, 1: idle
+            if (waited >= timeout_ms):
+                return False
+            epdconfig.delay_ms(50)
+            waited += 50
+        return True
         
     def set_lut(self):
         self.send_command(0x20)               # vcom
@@ -230,27 +247,59 @@ class EPD:
 
     def display(self, imageblack, imagered):
         self.send_command(0x10)
-        for i in range(0, self.width * self.height // 8):
-            self.send_data(~imageblack[i])
+        self.send_data_bulk([~b & 0xFF for b in imageblack])
         self.send_command(0x11)
         
         self.send_command(0x13)
-        for i in range(0, self.width * self.height // 8):
-            self.send_data(~imagered[i])
+        self.send_data_bulk([~b & 0xFF for b in imagered])
         self.send_command(0x11)
         
         self.send_command(0x12) 
         self.ReadBusy()
+
+    # Sends the window (x, y, w, h) of the given full size buffers and refreshes only that window.
+    # Coordinates are in panel orientation (EPD_WIDTH x EPD_HEIGHT), x and w must be multiples of 8
+    def display_partial(self, imageblack, imagered, x, y, w, h):
+        self.send_command(0x14) # PARTIAL_DATA_START_TRANSMISSION_1
+        self.send_window(x, y, w, h)
+        epdconfig.delay_ms(2)
+        self.send_data_bulk([~imageblack[i] & 0xFF for i in self.window_indices(x, y, w, h)])
+        epdconfig.delay_ms(2)
+
+        self.send_command(0x15) # PARTIAL_DATA_START_TRANSMISSION_2
+        self.send_window(x, y, w, h)
+        epdconfig.delay_ms(2)
+        self.send_data_bulk([~imagered[i] & 0xFF for i in self.window_indices(x, y, w, h)])
+        epdconfig.delay_ms(2)
+
+        self.send_command(0x16) # PARTIAL_DISPLAY_REFRESH
+        self.send_window(x, y, w, h)
+        self.ReadBusy()
+
+    def send_window(self, x, y, w, h):
+        self.send_data(x >> 8)
+        self.send_data(x & 0xf8) # x should be a multiple of 8, the last 3 bits are ignored
+        self.send_data(y >> 8)
+        self.send_data(y & 0xff)
+        self.send_data(w >> 8)
+        self.send_data(w & 0xf8) # w should be a multiple of 8, the last 3 bits are ignored
+        self.send_data(h >> 8)
+        self.send_data(h & 0xff)
+
+    # Buffer indices of the bytes inside the window (x, y, w, h), row by row
+    def window_indices(self, x, y, w, h):
+        for row in range(y, y + h):
+            start = (x + row * self.width) // 8
+            for i in range(start, start + w // 8):
+                yield i
         
     def Clear(self):
         self.send_command(0x10)
-        for i in range(0, self.width * self.height // 8):
-            self.send_data(0x00)
+        self.send_data_bulk([0x00] * (self.width * self.height // 8))
         self.send_command(0x11) 
         
         self.send_command(0x13)
-        for i in range(0, self.width * self.height // 8):
-            self.send_data(0x00)
+        self.send_data_bulk([0x00] * (self.width * self.height // 8))
         self.send_command(0x11)
         
         self.send_command(0x12) 
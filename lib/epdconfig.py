@@ -51,6 +51,15 @@ def delay_ms(delaytime):
 
 def spi_writebyte(data):
     SPI.writebytes(data)
+
+# Writes a whole buffer in one call, spidev splits it into transfers internally
+def spi_writebyte2(data):
+    if hasattr(SPI, 'writebytes2'):
+        SPI.writebytes2(data)
+    else:
+        # spidev < 3.3 has no writebytes2 and writebytes is limited to 4096 bytes per call
+        for i in range(0, len(data), 4096):
+            SPI.writebytes(data[i:i + 4096])
     
 def module_init():
     global SPI
@@ -61,7 +70,7 @@ def module_init():
     GPIO.setup(DC_PIN, GPIO.OUT)
     GPIO.setup(CS_PIN, GPIO.OUT)
     GPIO.setup(BUSY_PIN, GPIO.IN)
-    SPI.max_speed_hz = 2000000
+    SPI.max_speed_hz = 4000000
     SPI.mode = 0b00
     return 0
 